@@ -1,6 +1,7 @@
 import pygame
 import math
 import sys
+from operator import itemgetter
 import array
 import random
 
@@ -382,7 +383,7 @@ class Game:
                     
             # 2. Player
             # Sort back-to-front
-            draw_list.sort(key=lambda x: x[0], reverse=True)
+            draw_list.sort(key=itemgetter(0), reverse=True)
             
             for item in draw_list:
                 if item[1] == "poly":
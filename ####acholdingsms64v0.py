@@ -1,6 +1,7 @@
 import pygame
 import math
 import sys
+from operator import itemgetter
 import random
 
 # --- Constants & Configuration ---
@@ -472,7 +473,7 @@ class Game:
             res = project_triangle(tri, cx, cy, cz, cos_yaw, sin_yaw, RENDER_WIDTH, RENDER_HEIGHT, hw, hh)
             if res: screen_tris.append(res)
             
-        screen_tris.sort(key=lambda x: x[0], reverse=True)
+        screen_tris.sort(key=itemgetter(0), reverse=True)
         
         for z, pts, col in screen_tris:
             # Simple depth shading
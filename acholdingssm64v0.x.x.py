@@ -1,13 +1,32 @@
 import pygame
+import pygame.gfxdraw
 import math
 import sys
+import numpy as np
+
+try:
+    from numba import njit, prange
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+    # Numba is optional: without it the kernels below run as plain Python
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda f: f
+    prange = range
 
 # --- Constants & Configuration ---
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
-RENDER_WIDTH = 400  # Render at lower res for N64 feel + 60 FPS
-RENDER_HEIGHT = 300
+INTERNAL_SCALE = 1  # Extra downscale of the render target; 2 quarters pixel fill
+RENDER_WIDTH = 400 // INTERNAL_SCALE  # Render at lower res for N64 feel + 60 FPS
+RENDER_HEIGHT = 300 // INTERNAL_SCALE
+SHADE_LEVELS = 256  # Depth buckets per color in the shade table
+SHADE_FAR = 1200.0  # Depth where shading bottoms out (1 - z/2000 hits 0.4)
+GFX_COORD_LIMIT = 4096  # Larger screen coords fall back to pygame.draw (see Game.draw)
 FPS = 60
+HUD_INTERVAL_MS = 100  # Debug text refreshes at most 10 times a second
 
 # Colors
 BLACK = (0, 0, 0)
@@ -42,6 +61,15 @@ MAX_SPEED = 12.0
 FRICTION = 0.82
 TURN_SPEED = 0.09
 CAM_SMOOTH = 0.08
+FOV = 300 // INTERNAL_SCALE  # Projection scale (pixels, so it follows the render size)
+
+# Input bitmask bits passed to physics_step
+KEY_FORWARD = 1 << 0
+KEY_BACK = 1 << 1
+KEY_LEFT = 1 << 2
+KEY_RIGHT = 1 << 3
+KEY_JUMP = 1 << 4
+KEY_RUN = 1 << 5
 
 # --- Math Engine (Optimized) ---
 
@@ -50,155 +78,257 @@ class Vector3:
     def __init__(self, x, y, z):
         self.x, self.y, self.z = x, y, z
 
-class Triangle:
-    __slots__ = ['v1', 'v2', 'v3', 'color', 'z_depth']
-    def __init__(self, v1, v2, v3, color):
-        self.v1, self.v2, self.v3 = v1, v2, v3
-        self.color = color
-        self.z_depth = 0.0 # Placeholder for sort
+@njit(cache=True, fastmath=True, inline='always')
+def to_camera(x, y, z, cam_x, cam_y, cam_z, cos_yaw, sin_yaw):
+    x -= cam_x
+    z -= cam_z
+    return x * cos_yaw - z * sin_yaw, y - cam_y, x * sin_yaw + z * cos_yaw
 
-def project_triangle(tri, cam_x, cam_y, cam_z, cos_yaw, sin_yaw, width, height, half_w, half_h):
+@njit(cache=True, fastmath=True, boundscheck=False, parallel=True)
+def project_all(vx, vy, vz, tris, winding, cam_x, cam_y, cam_z, cos_yaw, sin_yaw, width, height, half_w, half_h,
+                out_z, out_sx, out_sy, out_valid):
     """
-    Optimized projection that returns a tuple (avg_z, points, color) or None.
-    Inlines vector math for speed.
+    Projects an indexed mesh: vx/vy/vz hold the vertices, tris (N,3) indexes them.
+    Every vertex is transformed once, then each triangle gathers its corners and
+    gets average depth, screen x/y per vertex and a visibility mask
+    (back-face + near clip + screen bounds) written into the out_* arrays.
+    Iterations only touch their own row, so both loops are split across cores.
     """
-    # Vertices extraction
-    v1, v2, v3 = tri.v1, tri.v2, tri.v3
-    
-    # 1. Camera Space Transformation
-    # Vertex 1
-    x1 = v1.x - cam_x
-    y1 = v1.y - cam_y
-    z1_raw = v1.z - cam_z
-    rx1 = x1 * cos_yaw - z1_raw * sin_yaw
-    rz1 = x1 * sin_yaw + z1_raw * cos_yaw
-    
-    # Vertex 2
-    x2 = v2.x - cam_x
-    y2 = v2.y - cam_y
-    z2_raw = v2.z - cam_z
-    rx2 = x2 * cos_yaw - z2_raw * sin_yaw
-    rz2 = x2 * sin_yaw + z2_raw * cos_yaw
-    
-    # Vertex 3
-    x3 = v3.x - cam_x
-    y3 = v3.y - cam_y
-    z3_raw = v3.z - cam_z
-    rx3 = x3 * cos_yaw - z3_raw * sin_yaw
-    rz3 = x3 * sin_yaw + z3_raw * cos_yaw
-
-    # 2. Near Clip Plane (Simple)
-    # If all points are behind the camera (z < 5), discard
-    if rz1 < 5 and rz2 < 5 and rz3 < 5:
-        return None
-
-    # 3. Projection
-    fov = 300  # FOV scale
-    
-    # Helper for single point projection
-    # Using a small epsilon to prevent div by zero for clipped verts that slide just in front
-    rz1 = max(rz1, 1.0)
-    rz2 = max(rz2, 1.0)
-    rz3 = max(rz3, 1.0)
-
-    sx1 = (rx1 * fov) / rz1 + half_w
-    sy1 = -(y1 * fov) / rz1 + half_h
-    
-    sx2 = (rx2 * fov) / rz2 + half_w
-    sy2 = -(y2 * fov) / rz2 + half_h
-    
-    sx3 = (rx3 * fov) / rz3 + half_w
-    sy3 = -(y3 * fov) / rz3 + half_h
+    nv = vx.shape[0]
+    cam_rx = np.empty(nv)
+    cam_ry = np.empty(nv)
+    cam_rz = np.empty(nv)
+    scr_x = np.empty(nv)
+    scr_y = np.empty(nv)
+    for j in prange(nv):
+        rx, ry, rz = to_camera(vx[j], vy[j], vz[j], cam_x, cam_y, cam_z, cos_yaw, sin_yaw)
+        cam_rx[j], cam_ry[j], cam_rz[j] = rx, ry, rz
+        # Epsilon to prevent div by zero for clipped verts that slide just in front;
+        # one reciprocal per vertex, shared by x and y
+        inv = FOV / max(rz, 1.0)
+        scr_x[j] = rx * inv + half_w
+        scr_y[j] = half_h - ry * inv
+
+    for i in prange(tris.shape[0]):
+        out_valid[i] = False
+
+        # 1. Camera Space Vertices
+        a, b, c = tris[i, 0], tris[i, 1], tris[i, 2]
+        rx1, ry1, rz1 = cam_rx[a], cam_ry[a], cam_rz[a]
+        rx2, ry2, rz2 = cam_rx[b], cam_ry[b], cam_rz[b]
+        rx3, ry3, rz3 = cam_rx[c], cam_ry[c], cam_rz[c]
+
+        # 2. Back-face Cull (camera sits at the origin in camera space)
+        # winding orients the face normal outward; 0 means double-sided
+        w = winding[i]
+        if w != 0:
+            ax, ay, az = rx2 - rx1, ry2 - ry1, rz2 - rz1
+            bx, by, bz = rx3 - rx1, ry3 - ry1, rz3 - rz1
+            nx = ay * bz - az * by
+            ny = az * bx - ax * bz
+            nz = ax * by - ay * bx
+            if (nx * rx1 + ny * ry1 + nz * rz1) * w >= 0:
+                continue
+
+        # 3. Near Clip Plane (Simple)
+        # All points behind the camera (z < 5); folded into the mask below
+        behind = (rz1 < 5) & (rz2 < 5) & (rz3 < 5)
+
+        # 4. Projection (already done per vertex)
+        sx1, sy1 = scr_x[a], scr_y[a]
+        sx2, sy2 = scr_x[b], scr_y[b]
+        sx3, sy3 = scr_x[c], scr_y[c]
+
+        # 5. Screen Bounds Culling
+        # Screen bounding box entirely outside the render target, or covering
+        # less than a pixel. Bitwise | on the comparisons instead of
+        # short-circuit or, so the whole test is branch-free; the outputs
+        # are always written and out_valid decides whether they are used.
+        xmin, xmax = min(sx1, sx2, sx3), max(sx1, sx2, sx3)
+        ymin, ymax = min(sy1, sy2, sy3), max(sy1, sy2, sy3)
+        off_screen = ((xmax < 0) | (xmin >= width) | (ymax < 0) | (ymin >= height) |
+                      ((xmax - xmin) * (ymax - ymin) < 1.0))
+
+        out_sx[i, 0], out_sx[i, 1], out_sx[i, 2] = sx1, sx2, sx3
+        out_sy[i, 0], out_sy[i, 1], out_sy[i, 2] = sy1, sy2, sy3
+        out_z[i] = (max(rz1, 1.0) + max(rz2, 1.0) + max(rz3, 1.0)) * 0.33333
+        out_valid[i] = not (behind | off_screen)
+
+def project_all_np(vx, vy, vz, tris, winding, cam_x, cam_y, cam_z, cos_yaw, sin_yaw, width, height, half_w, half_h,
+                   out_z, out_sx, out_sy, out_valid):
+    """
+    NumPy version of project_all (same arguments and outputs).
+    A handful of whole-array ops instead of per-vertex/per-triangle loops, used when Numba is missing.
+    """
+    dx = vx - cam_x
+    dz = vz - cam_z
+    vrx = dx * cos_yaw - dz * sin_yaw
+    vry = vy - cam_y
+    vrz = dx * sin_yaw + dz * cos_yaw
+    vrz_c = np.maximum(vrz, 1.0)
+    inv = FOV / vrz_c
+    rx, ry, rz = vrx[tris], vry[tris], vrz[tris]
+
+    # Back-face: camera-space normal against the vector to the camera (origin)
+    ax, ay, az = rx[:, 1] - rx[:, 0], ry[:, 1] - ry[:, 0], rz[:, 1] - rz[:, 0]
+    bx, by, bz = rx[:, 2] - rx[:, 0], ry[:, 2] - ry[:, 0], rz[:, 2] - rz[:, 0]
+    facing = ((ay * bz - az * by) * rx[:, 0] + (az * bx - ax * bz) * ry[:, 0] +
+              (ax * by - ay * bx) * rz[:, 0]) * winding < 0
+    facing |= winding == 0
+
+    in_front = (rz >= 5).any(axis=1)
+
+    np.take(vrx * inv + half_w, tris, out=out_sx)
+    np.take(half_h - vry * inv, tris, out=out_sy)
+    np.multiply(vrz_c[tris].sum(axis=1), 0.33333, out=out_z)
+
+    xmin, xmax = out_sx.min(axis=1), out_sx.max(axis=1)
+    ymin, ymax = out_sy.min(axis=1), out_sy.max(axis=1)
+    off_screen = ((xmax < 0) | (xmin >= width) | (ymax < 0) | (ymin >= height) |
+                  ((xmax - xmin) * (ymax - ymin) < 1.0))
+    np.logical_and(facing & in_front, ~off_screen, out=out_valid)
+
+if not HAVE_NUMBA:
+    # An interpreted per-triangle loop would be far slower than the vectorized form
+    project_all = project_all_np
+
+def pack_rgb(colors):
+    """(k,3) RGB triples -> (k,) uint32 packed as 0x00RRGGBB"""
+    c = np.asarray(colors, np.uint32).reshape(-1, 3)
+    return (c[:, 0] << 16) | (c[:, 1] << 8) | c[:, 2]
+
+def build_shade_lut(palette):
+    """
+    Flat list of shaded (r, g, b) tuples for a (P,) packed palette:
+    entry pal * SHADE_LEVELS + bucket is color pal at the near edge of depth bucket.
+    Simple depth shading: one 8.8 fixed-point multiply per channel.
+    """
+    z = np.arange(SHADE_LEVELS) * (SHADE_FAR / SHADE_LEVELS)
+    shade = (256.0 - np.minimum(z * (256 / 2000.0), 0.6 * 256)).astype(np.uint32)
+    packed = palette.astype(np.uint32)[:, None]
+    r = (((packed >> 16) & 0xFF) * shade) >> 8
+    g = (((packed >> 8) & 0xFF) * shade) >> 8
+    b = ((packed & 0xFF) * shade) >> 8
+    return list(zip(r.ravel().tolist(), g.ravel().tolist(), b.ravel().tolist()))
+
+def shade_index(pal, z):
+    """Shade table index for palette indices pal at average depths z."""
+    bucket = np.minimum(z * (SHADE_LEVELS / SHADE_FAR), SHADE_LEVELS - 1).astype(np.intp)
+    return pal * SHADE_LEVELS + bucket
+
+def depth_scale(zmax):
+    """Key scale that spreads depths 0..zmax over the whole uint16 range."""
+    return 65535.0 / max(zmax, 1.0)
+
+def depth_key(z, scale):
+    """
+    Average depth -> uint16 sort key, ascending far-to-near (1/scale units).
+    A stable argsort on 16-bit ints is a radix sort in NumPy.
+    """
+    return 65535 - np.minimum(z * scale, 65535).astype(np.uint16)
 
-    # 4. Screen Bounds Culling (Simple)
-    # If all points are off to one side, discard
-    if (sx1 < -width and sx2 < -width and sx3 < -width) or \
-       (sx1 > width*2 and sx2 > width*2 and sx3 > width*2) or \
-       (sy1 < -height and sy2 < -height and sy3 < -height) or \
-       (sy1 > height*2 and sy2 > height*2 and sy3 > height*2):
-        return None
+def sort_by_depth(z, scale):
+    """Stable far-to-near permutation of depths z, and their keys in that order."""
+    key = depth_key(z, scale)
+    by_depth = np.argsort(key, kind='stable')
+    return by_depth, key[by_depth]
 
-    avg_z = (rz1 + rz2 + rz3) * 0.33333
-    return (avg_z, [(sx1, sy1), (sx2, sy2), (sx3, sy3)], tri.color)
+def project_visible(vx, vy, vz, tris, winding, cam, out_z, out_sx, out_sy, out_valid):
+    """
+    Runs project_all on one indexed batch and returns the indices of its visible triangles.
+    cam is (cam_x, cam_y, cam_z, cos_yaw, sin_yaw, width, height, half_w, half_h).
+    """
+    project_all(vx, vy, vz, tris, winding, *cam, out_z, out_sx, out_sy, out_valid)
+    return np.flatnonzero(out_valid)
+
+def visible_objects(bounds, cam_x, cam_y, cam_z, cos_yaw, sin_yaw, half_w, half_h):
+    """
+    Frustum test on (M,4) bounding spheres. Returns a bool mask of objects
+    that may have visible triangles (conservative: spheres crossing a plane stay in).
+    """
+    dx = bounds[:, 0] - cam_x
+    dz = bounds[:, 2] - cam_z
+    rx = dx * cos_yaw - dz * sin_yaw
+    ry = bounds[:, 1] - cam_y
+    rz = dx * sin_yaw + dz * cos_yaw
+    r = bounds[:, 3]
+
+    # Side planes pass through the camera: x * FOV = +-z * half_w (same for y)
+    kx = math.hypot(FOV, half_w)
+    ky = math.hypot(FOV, half_h)
+    outside = ((rz + r < 5) |
+               (rx * FOV - rz * half_w > r * kx) | (-rx * FOV - rz * half_w > r * kx) |
+               (ry * FOV - rz * half_h > r * ky) | (-ry * FOV - rz * half_h > r * ky))
+    return ~outside
 
 
 # --- Level Builder Helpers (Low Poly Versions) ---
 
-def add_box(tris, cx, by, cz, w, h, d, top_col, front_col, side_col):
-    hw, hd = w * 0.5, d * 0.5
-    x0, x1 = cx - hw, cx + hw
-    y0, y1 = by, by + h
-    z0, z1 = cz - hd, cz + hd
-
-    # Pre-allocate vectors
-    v_bl_f = Vector3(x0, y0, z0) # Bottom Left Front
-    v_br_f = Vector3(x1, y0, z0) # Bottom Right Front
-    v_tl_f = Vector3(x0, y1, z0) # Top Left Front
-    v_tr_f = Vector3(x1, y1, z0) # Top Right Front
-    
-    v_bl_b = Vector3(x0, y0, z1) # Back
-    v_br_b = Vector3(x1, y0, z1)
-    v_tl_b = Vector3(x0, y1, z1)
-    v_tr_b = Vector3(x1, y1, z1)
-
-    # Top
-    tris.append(Triangle(v_tl_f, v_tr_f, v_tr_b, top_col))
-    tris.append(Triangle(v_tl_f, v_tr_b, v_tl_b, top_col))
-    # Front
-    tris.append(Triangle(v_bl_f, v_br_f, v_tr_f, front_col))
-    tris.append(Triangle(v_bl_f, v_tr_f, v_tl_f, front_col))
-    # Back
-    tris.append(Triangle(v_br_b, v_bl_b, v_tl_b, front_col))
-    tris.append(Triangle(v_br_b, v_tl_b, v_tr_b, front_col))
-    # Left
-    tris.append(Triangle(v_bl_b, v_bl_f, v_tl_f, side_col))
-    tris.append(Triangle(v_bl_b, v_tl_f, v_tl_b, side_col))
-    # Right
-    tris.append(Triangle(v_br_f, v_br_b, v_tr_b, side_col))
-    tris.append(Triangle(v_br_f, v_tr_b, v_tr_f, side_col))
-
-def add_cylinder(tris, cx, by, cz, radius, height, segments, top_col, side_col):
-    step = (2 * math.pi) / segments
+# Unit box (x, z in [-0.5, 0.5], y in [0, 1]) as 10 triangles (no bottom face).
+# Corners: bottom/top, left/right, front (z0) / back (z1)
+_BL_F, _BR_F, _TL_F, _TR_F = (-0.5, 0, -0.5), (0.5, 0, -0.5), (-0.5, 1, -0.5), (0.5, 1, -0.5)
+_BL_B, _BR_B, _TL_B, _TR_B = (-0.5, 0, 0.5), (0.5, 0, 0.5), (-0.5, 1, 0.5), (0.5, 1, 0.5)
+_BOX_TRIS = np.array([
+    (_TL_F, _TR_F, _TR_B), (_TL_F, _TR_B, _TL_B),  # Top
+    (_BL_F, _BR_F, _TR_F), (_BL_F, _TR_F, _TL_F),  # Front
+    (_BR_B, _BL_B, _TL_B), (_BR_B, _TL_B, _TR_B),  # Back
+    (_BL_B, _BL_F, _TL_F), (_BL_B, _TL_F, _TL_B),  # Left
+    (_BR_F, _BR_B, _TR_B), (_BR_F, _TR_B, _TR_F),  # Right
+])
+# Which of (top_col, front_col, side_col) each box triangle uses
+_BOX_FACE = np.array([0, 0, 1, 1, 1, 1, 2, 2, 2, 2])
+
+def add_box(level, cx, by, cz, w, h, d, top_col, front_col, side_col, open_bottom=False):
+    # Scale + translate the unit template in one go
+    verts = _BOX_TRIS * (w, h, d) + (cx, by, cz)
+    colors = np.array((top_col, front_col, side_col), np.uint8)[_BOX_FACE]
+    # The template has no bottom face: boxes that can be seen from below show their insides
+    level.add_tris(verts, colors, (cx, by + h * 0.5, cz), double_sided=open_bottom)
+
+# cos/sin of the segment angles (segments + 1 entries, last == first), shared by every ring
+_TRIG = {}
+
+def circle_table(segments):
+    tab = _TRIG.get(segments)
+    if tab is None:
+        angles = np.linspace(0.0, 2 * math.pi, segments + 1)
+        tab = _TRIG[segments] = (np.cos(angles), np.sin(angles))
+    return tab
+
+for _segs in (4, 6, 8, 12, 16):
+    circle_table(_segs)
+
+def ring(cx, y, cz, radius, segments):
+    """(segments + 1, 3) points around a horizontal circle."""
+    cos_t, sin_t = circle_table(segments)
+    pts = np.empty((segments + 1, 3))
+    pts[:, 0] = cx + cos_t * radius
+    pts[:, 1] = y
+    pts[:, 2] = cz + sin_t * radius
+    return pts
+
+def add_cylinder(level, cx, by, cz, radius, height, segments, top_col, side_col):
     top_y = by + height
-    
-    # Precompute sin/cos to save time
-    cache = []
-    for i in range(segments + 1):
-        angle = i * step
-        cache.append((math.cos(angle) * radius, math.sin(angle) * radius))
-
-    center_top = Vector3(cx, top_y, cz)
-
-    for i in range(segments):
-        x0, z0 = cache[i]
-        x1, z1 = cache[i+1]
-        
-        t0 = Vector3(cx + x0, top_y, cz + z0)
-        t1 = Vector3(cx + x1, top_y, cz + z1)
-        b0 = Vector3(cx + x0, by, cz + z0)
-        b1 = Vector3(cx + x1, by, cz + z1)
-
-        tris.append(Triangle(center_top, t1, t0, top_col))
-        tris.append(Triangle(t0, t1, b1, side_col))
-        tris.append(Triangle(t0, b1, b0, side_col))
-
-def add_cone(tris, cx, by, cz, radius, height, segments, color):
-    step = (2 * math.pi) / segments
-    apex = Vector3(cx, by + height, cz)
-    
-    cache = []
-    for i in range(segments + 1):
-        angle = i * step
-        cache.append((math.cos(angle) * radius, math.sin(angle) * radius))
-
-    for i in range(segments):
-        x0, z0 = cache[i]
-        x1, z1 = cache[i+1]
-        b0 = Vector3(cx + x0, by, cz + z0)
-        b1 = Vector3(cx + x1, by, cz + z1)
-        tris.append(Triangle(b0, b1, apex, color))
-
-def add_battlements(tris, cx, by, cz, length, is_z_axis, col, count=5):
+    top = ring(cx, top_y, cz, radius, segments)
+    bot = ring(cx, by, cz, radius, segments)
+    t0, t1, b0, b1 = top[:-1], top[1:], bot[:-1], bot[1:]
+
+    # Per segment: top cap slice + two side triangles
+    tris = np.empty((segments, 3, 3, 3))
+    tris[:, 0] = np.stack((np.broadcast_to((cx, top_y, cz), t1.shape), t1, t0), axis=1)
+    tris[:, 1] = np.stack((t0, t1, b1), axis=1)
+    tris[:, 2] = np.stack((t0, b1, b0), axis=1)
+    level.add_tris(tris.reshape(-1, 3, 3), [top_col, side_col, side_col] * segments,
+                   (cx, by + height * 0.5, cz))
+
+def add_cone(level, cx, by, cz, radius, height, segments, color):
+    base = ring(cx, by, cz, radius, segments)
+    apex = np.broadcast_to((cx, by + height, cz), (segments, 3))
+    tris = np.stack((base[:-1], base[1:], apex), axis=1)
+    # No base cap, so the inside is visible from under the eaves
+    level.add_tris(tris, [color] * segments, (cx, by, cz), double_sided=True)
+
+def add_battlements(level, cx, by, cz, length, is_z_axis, col, count=5):
     """Simplified battlements: Fewer, larger blocks to save FPS."""
     merlon_w = length / (count * 2 - 1)
     h, d = 20, 15
@@ -208,273 +338,498 @@ def add_battlements(tris, cx, by, cz, length, is_z_axis, col, count=5):
     for i in range(count):
         pos = start_offset + i * merlon_w * 2
         if is_z_axis:
-            add_box(tris, cx, by, cz + pos, d, h, merlon_w, col, CASTLE_DARK, CASTLE_DARK)
+            add_box(level, cx, by, cz + pos, d, h, merlon_w, col, CASTLE_DARK, CASTLE_DARK)
         else:
-            add_box(tris, cx + pos, by, cz, merlon_w, h, d, col, CASTLE_DARK, CASTLE_DARK)
+            add_box(level, cx + pos, by, cz, merlon_w, h, d, col, CASTLE_DARK, CASTLE_DARK)
 
-def add_peach_tower(tris, cx, by, cz, radius, height, roof_height, wall_color, roof_color):
+def add_peach_tower(level, cx, by, cz, radius, height, roof_height, wall_color, roof_color):
     """Low poly tower (8 segments)."""
     segs = 8
     # Base
-    add_cylinder(tris, cx, by, cz, radius, height, segs, wall_color, wall_color)
+    add_cylinder(level, cx, by, cz, radius, height, segs, wall_color, wall_color)
     # Roof
-    add_cone(tris, cx, by + height, cz, radius * 1.2, roof_height, segs, roof_color)
+    add_cone(level, cx, by + height, cz, radius * 1.2, roof_height, segs, roof_color)
     # Simplified windows (just 1 row, 4 windows)
-    for i in range(4):
-        ang = i * (math.pi / 2)
-        wx = cx + math.cos(ang) * radius * 0.9
-        wz = cz + math.sin(ang) * radius * 0.9
-        add_box(tris, wx, by + height * 0.6, wz, 12, 20, 12, WINDOW_BLUE, WINDOW_BLUE, WINDOW_BLUE)
+    for wx, _, wz in ring(cx, 0, cz, radius * 0.9, 4)[:4]:
+        add_box(level, wx, by + height * 0.6, wz, 12, 20, 12, WINDOW_BLUE, WINDOW_BLUE, WINDOW_BLUE)
 
 # --- Level ---
 
 class Level:
     def __init__(self):
-        self.triangles = []
+        # Indexed mesh, filled through write cursors by the add_* helpers:
+        # shared vertices (SoA) plus per-triangle vertex indices, color and winding
+        self.nverts = 0
+        self.vx_buf = np.empty(0, np.float32)
+        self.vy_buf = np.empty(0, np.float32)
+        self.vz_buf = np.empty(0, np.float32)
+        self._vert_index = {}
+        self.count = 0
+        self.tri_buf = np.empty((0, 3), np.int32)
+        self.color_buf = np.empty(0, np.uint32)
+        self.winding_buf = np.empty(0, np.int8)
+        self.plane_buf = np.empty((0, 4), np.float64)
+        self._grow(self.TRI_BUFS, 0, 1024)
+        self._grow(self.VERT_BUFS, 0, 1024)
+        # One bounding sphere (cx, cy, cz, radius) + triangle count per add_tris call
+        self.bounds = []
+        self.obj_counts = []
         self.build()
 
+        # Trim to what was written and freeze; the renderer only reads these
+        n, nv = self.count, self.nverts
+        self.vx, self.vy, self.vz = self.vx_buf[:nv], self.vy_buf[:nv], self.vz_buf[:nv]
+        self.tris = self.tri_buf[:n]
+        self.colors = self.color_buf[:n]
+        self.winding = self.winding_buf[:n]
+        self.planes = self.plane_buf[:n]
+        self.bounds = np.array(self.bounds, np.float32).reshape(-1, 4)
+        self.obj_counts = np.array(self.obj_counts, np.intp)
+        self._vert_index = None
+        for arr in (self.vx, self.vy, self.vz, self.tris, self.colors, self.winding, self.planes,
+                    self.bounds, self.obj_counts):
+            arr.flags.writeable = False
+
+    TRI_BUFS = ('tri_buf', 'color_buf', 'winding_buf', 'plane_buf')
+    VERT_BUFS = ('vx_buf', 'vy_buf', 'vz_buf')
+
+    def _grow(self, names, used, n):
+        # Make room for n more rows past used in the named buffers (amortized doubling)
+        need = used + n
+        cap = getattr(self, names[0]).shape[0]
+        if need <= cap:
+            return
+        cap = max(need, cap * 2)
+        for name in names:
+            old = getattr(self, name)
+            new = np.empty((cap,) + old.shape[1:], old.dtype)
+            new[:used] = old[:used]
+            setattr(self, name, new)
+
+    def _get_v(self, x, y, z):
+        # Index of the vertex at (x, y, z), shared with any earlier one within 1e-3
+        key = (round(x, 3), round(y, 3), round(z, 3))
+        i = self._vert_index.get(key)
+        if i is None:
+            i = self._vert_index[key] = self.nverts
+            self._grow(self.VERT_BUFS, i, 1)
+            self.vx_buf[i], self.vy_buf[i], self.vz_buf[i] = x, y, z
+            self.nverts = i + 1
+        return i
+
+    def add_tris(self, tris, colors, center, double_sided=False):
+        """
+        Appends k triangles: tris is (k,3,3) [tri][vertex][xyz], colors is (k,3) RGB,
+        stored packed (see pack_rgb). Corners are merged into the shared vertex list.
+        center is a point inside the closed solid, used to record each triangle's
+        winding so its normal can be oriented outward for back-face culling.
+        Open geometry (inside visible) passes double_sided and stores winding 0.
+        """
+        tris = np.asarray(tris, np.float64)
+        k = tris.shape[0]
+        self._grow(self.TRI_BUFS, self.count, k)
+        c = self.count
+        get_v = self._get_v
+        self.tri_buf[c:c+k] = np.array([get_v(x, y, z) for x, y, z in tris.reshape(-1, 3).tolist()],
+                                       np.int32).reshape(k, 3)
+        self.color_buf[c:c+k] = pack_rgb(colors)
+
+        v1, v2, v3 = tris[:, 0], tris[:, 1], tris[:, 2]
+        normal = np.cross(v2 - v1, v3 - v1)
+        outward = (v1 + v2 + v3) / 3.0 - center
+        winding = np.sign((normal * outward).sum(axis=1))
+        if double_sided:
+            winding[:] = 0
+        self.winding_buf[c:c+k] = winding
+
+        # World-space outward plane (n, d) per triangle: the camera sees the
+        # front face iff n . cam > d. Double-sided ones get (0, 0, 0, -1), always true.
+        n_out = normal * winding[:, None]
+        planes = np.column_stack((n_out, (n_out * v1).sum(axis=1)))
+        self.plane_buf[c:c+k] = np.where((winding != 0)[:, None], planes, (0.0, 0.0, 0.0, -1.0))
+        self.count = c + k
+
+        # Each call is one object for frustum rejection: sphere around center
+        radius = np.sqrt(((tris - center) ** 2).sum(axis=2).max())
+        self.bounds.append((center[0], center[1], center[2], radius))
+        self.obj_counts.append(k)
+
     def build(self):
-        t = self.triangles
-        
         # 1. GROUND (Big single quads for performance)
-        add_box(t, 0, -10, 0, 1500, 10, 1500, GRASS_GREEN, DARK_GREEN, DARK_GREEN)
-        add_box(t, 0, -9, 200, 140, 2, 700, COBBLE, COBBLE, COBBLE) # Path
-        add_cylinder(t, 0, -9, 50, 230, 2, 12, COBBLE, COBBLE) # Courtyard
+        add_box(self, 0, -10, 0, 1500, 10, 1500, GRASS_GREEN, DARK_GREEN, DARK_GREEN)
+        add_box(self, 0, -9, 200, 140, 2, 700, COBBLE, COBBLE, COBBLE) # Path
+        add_cylinder(self, 0, -9, 50, 230, 2, 12, COBBLE, COBBLE) # Courtyard
 
         # 2. MOAT (Simple blue plane)
-        add_box(t, 0, -8, -80, 700, 6, 160, WATER_BLUE, WATER_BLUE, WATER_BLUE)
-        add_box(t, 0, 0, -80, 100, 4, 160, WOOD_BROWN, WOOD_BROWN, WOOD_BROWN) # Bridge
+        add_box(self, 0, -8, -80, 700, 6, 160, WATER_BLUE, WATER_BLUE, WATER_BLUE)
+        add_box(self, 0, 0, -80, 100, 4, 160, WOOD_BROWN, WOOD_BROWN, WOOD_BROWN) # Bridge
 
         # 3. CASTLE WALLS
         wall_h = 80
         # Front walls
-        add_box(t, -290, 0, -160, 220, wall_h, 30, CASTLE_STONE, CASTLE_STONE, CASTLE_DARK)
-        add_box(t, 290, 0, -160, 220, wall_h, 30, CASTLE_STONE, CASTLE_STONE, CASTLE_DARK)
+        add_box(self, -290, 0, -160, 220, wall_h, 30, CASTLE_STONE, CASTLE_STONE, CASTLE_DARK)
+        add_box(self, 290, 0, -160, 220, wall_h, 30, CASTLE_STONE, CASTLE_STONE, CASTLE_DARK)
         # Side walls
-        add_box(t, -390, 0, 170, 30, wall_h, 660, CASTLE_STONE, CASTLE_DARK, CASTLE_STONE)
-        add_box(t, 390, 0, 170, 30, wall_h, 660, CASTLE_STONE, CASTLE_DARK, CASTLE_STONE)
+        add_box(self, -390, 0, 170, 30, wall_h, 660, CASTLE_STONE, CASTLE_DARK, CASTLE_STONE)
+        add_box(self, 390, 0, 170, 30, wall_h, 660, CASTLE_STONE, CASTLE_DARK, CASTLE_STONE)
         
         # Battlements (Simplified)
-        add_battlements(t, -290, wall_h, -160, 200, False, CASTLE_STONE, 4)
-        add_battlements(t, 290, wall_h, -160, 200, False, CASTLE_STONE, 4)
-        add_battlements(t, -390, wall_h, 170, 640, True, CASTLE_STONE, 8)
-        add_battlements(t, 390, wall_h, 170, 640, True, CASTLE_STONE, 8)
+        add_battlements(self, -290, wall_h, -160, 200, False, CASTLE_STONE, 4)
+        add_battlements(self, 290, wall_h, -160, 200, False, CASTLE_STONE, 4)
+        add_battlements(self, -390, wall_h, 170, 640, True, CASTLE_STONE, 8)
+        add_battlements(self, 390, wall_h, 170, 640, True, CASTLE_STONE, 8)
 
         # 4. CORNER TOWERS
         for tx, tz in [(-390, -160), (390, -160), (-390, 500), (390, 500)]:
-            add_peach_tower(t, tx, 0, tz, 55, 100, 60, TOWER_COLOR, CASTLE_ROOF)
+            add_peach_tower(self, tx, 0, tz, 55, 100, 60, TOWER_COLOR, CASTLE_ROOF)
 
         # 5. MAIN CASTLE
         c_z = 200
         # Body
-        add_box(t, 0, 0, c_z, 460, 160, 300, CASTLE_STONE, CASTLE_STONE, CASTLE_STONE)
+        add_box(self, 0, 0, c_z, 460, 160, 300, CASTLE_STONE, CASTLE_STONE, CASTLE_STONE)
         
         # Main Tower (Keep)
-        add_cylinder(t, 0, 0, c_z + 20, 85, 280, 12, TOWER_COLOR, TOWER_COLOR)
-        add_cone(t, 0, 280, c_z + 20, 100, 120, 12, CASTLE_ROOF)
+        add_cylinder(self, 0, 0, c_z + 20, 85, 280, 12, TOWER_COLOR, TOWER_COLOR)
+        add_cone(self, 0, 280, c_z + 20, 100, 120, 12, CASTLE_ROOF)
         # Peach Window
-        add_box(t, 0, 180, c_z - 65, 40, 60, 10, WINDOW_BLUE, WINDOW_BLUE, WINDOW_BLUE)
+        add_box(self, 0, 180, c_z - 65, 40, 60, 10, WINDOW_BLUE, WINDOW_BLUE, WINDOW_BLUE)
         
         # Side Towers
         for tx, tz in [(-230, c_z - 150), (230, c_z - 150), (-230, c_z + 150), (230, c_z + 150)]:
-            add_peach_tower(t, tx, 0, tz, 60, 180, 80, TOWER_COLOR, CASTLE_ROOF)
+            add_peach_tower(self, tx, 0, tz, 60, 180, 80, TOWER_COLOR, CASTLE_ROOF)
 
         # 6. TREES (Low poly 4-sided)
         for tx, tz in [(-180, 80), (180, 80), (-220, -60), (220, -60)]:
-            add_cylinder(t, tx, 0, tz, 10, 30, 4, WOOD_BROWN, WOOD_BROWN)
-            add_cone(t, tx, 30, tz, 40, 60, 4, DARK_GREEN)
+            add_cylinder(self, tx, 0, tz, 10, 30, 4, WOOD_BROWN, WOOD_BROWN)
+            add_cone(self, tx, 30, tz, 40, 60, 4, DARK_GREEN)
 
         # 7. FLOATING PLATFORMS (Gameplay)
         for pos in [(0, 120, -20), (150, 80, -100), (-150, 80, -100)]:
-            add_box(t, pos[0], pos[1], pos[2], 40, 40, 40, YELLOW, GOLD, GOLD)
+            add_box(self, pos[0], pos[1], pos[2], 40, 40, 40, YELLOW, GOLD, GOLD, open_bottom=True)
 
 # --- Player ---
 
+@njit(cache=True, fastmath=True)
+def physics_step(px, py, pz, vx, vy, vz, yaw, grounded, kb):
+    """
+    One frame of player physics on plain floats; returns the new (pos, vel, yaw, grounded).
+    kb is the input bitmask built by Player.update (see the KEY_* bits).
+    """
+    # Input (back wins over forward, right over left, as with the old if-chain)
+    forward = -1 if kb & KEY_BACK else (kb & KEY_FORWARD)
+    turning = -1 if kb & KEY_RIGHT else (kb & KEY_LEFT) >> 2
+    jump = kb & KEY_JUMP
+    speed = RUN_SPEED if kb & KEY_RUN else MOVE_SPEED
+
+    # Physics
+    yaw += turning * TURN_SPEED
+
+    # Movement
+    if forward != 0:
+        vx += math.sin(yaw) * speed * forward
+        vz += math.cos(yaw) * speed * forward
+
+    # Friction
+    vx *= FRICTION
+    vz *= FRICTION
+
+    # Jump
+    if jump and grounded:
+        vy = JUMP_FORCE
+        grounded = False
+
+    # Gravity
+    vy -= GRAVITY
+
+    # Integration
+    px += vx
+    py += vy
+    pz += vz
+
+    # Simple Floor Collision
+    if py < 0:
+        py = 0.0
+        vy = 0.0
+        grounded = True
+
+    return px, py, pz, vx, vy, vz, yaw, grounded
+
 class Player:
     def __init__(self, x, y, z):
-        self.pos = Vector3(x, y, z)
-        self.vel = Vector3(0, 0, 0)
+        # Floats throughout so physics_step always sees the same types
+        self.pos = Vector3(float(x), float(y), float(z))
+        self.vel = Vector3(0.0, 0.0, 0.0)
         self.yaw = 0.0
         self.grounded = False
+        # World-space mesh corners, refilled by get_mesh each frame
+        self.mesh_vx = np.empty(8, np.float32)
+        self.mesh_vy = np.empty(8, np.float32)
+        self.mesh_vz = np.empty(8, np.float32)
+        # (yaw, cos(-yaw), sin(-yaw)) of the last mesh rebuild
+        self._mesh_trig = (None, 1.0, 0.0)
+        self._key_consts = (pygame.K_UP, pygame.K_w, pygame.K_DOWN, pygame.K_s,
+                            pygame.K_LEFT, pygame.K_a, pygame.K_RIGHT, pygame.K_d,
+                            pygame.K_SPACE, pygame.K_LSHIFT, pygame.K_RSHIFT)
 
     def update(self, keys, dt):
-        # Input
-        speed = RUN_SPEED if (keys[pygame.K_LSHIFT] or keys[pygame.K_RSHIFT]) else MOVE_SPEED
-        forward = 0
-        turning = 0
-
-        if keys[pygame.K_UP] or keys[pygame.K_w]: forward = 1
-        if keys[pygame.K_DOWN] or keys[pygame.K_s]: forward = -1
-        if keys[pygame.K_LEFT] or keys[pygame.K_a]: turning = 1
-        if keys[pygame.K_RIGHT] or keys[pygame.K_d]: turning = -1
-
-        # Physics
-        self.yaw += turning * TURN_SPEED
-        
-        # Movement
-        if forward != 0:
-            self.vel.x += math.sin(self.yaw) * speed * forward
-            self.vel.z += math.cos(self.yaw) * speed * forward
-
-        # Friction
-        self.vel.x *= FRICTION
-        self.vel.z *= FRICTION
-
-        # Jump
-        if keys[pygame.K_SPACE] and self.grounded:
-            self.vel.y = JUMP_FORCE
-            self.grounded = False
-
-        # Gravity
-        self.vel.y -= GRAVITY
-
-        # Integration
-        self.pos.x += self.vel.x
-        self.pos.y += self.vel.y
-        self.pos.z += self.vel.z
-
-        # Simple Floor Collision
-        if self.pos.y < 0:
-            self.pos.y = 0
-            self.vel.y = 0
-            self.grounded = True
-
-    def get_mesh_tris(self):
-        # Simple Cube Mario
-        s = 12
+        # Input: one pass over the key table into a bitmask for the kernel
+        up, w, down, s, left, a, right, d, space, lshift, rshift = self._key_consts
+        kb = ((keys[up] or keys[w]) * KEY_FORWARD | (keys[down] or keys[s]) * KEY_BACK |
+              (keys[left] or keys[a]) * KEY_LEFT | (keys[right] or keys[d]) * KEY_RIGHT |
+              keys[space] * KEY_JUMP | (keys[lshift] or keys[rshift]) * KEY_RUN)
+
+        p, v = self.pos, self.vel
+        (p.x, p.y, p.z, v.x, v.y, v.z, self.yaw, self.grounded) = physics_step(
+            p.x, p.y, p.z, v.x, v.y, v.z, self.yaw, self.grounded, kb)
+
+    # Simple Cube Mario: one box (Body + Hat conceptually), 8 corners relative
+    # to the player center. Front face is z = -s, back face z = +s.
+    _S = 12
+    MESH_X = np.array([-_S, _S, _S, -_S, -_S, _S, _S, -_S], np.float64)
+    MESH_Y = np.array([0, 0, _S*2, _S*2, 0, 0, _S*2, _S*2], np.float64)
+    MESH_Z = np.array([-_S, -_S, -_S, -_S, _S, _S, _S, _S], np.float64)
+    # Box indices into the 8 corners: Front, Back, Top (Hat)
+    MESH_IDX = np.array([(0, 1, 2), (0, 2, 3), (5, 4, 7), (5, 7, 6), (3, 2, 6), (3, 6, 7)], np.int32)
+    MESH_COLORS = pack_rgb([BLUE, BLUE, RED, RED, RED, RED])
+    MESH_WINDING = np.zeros(6, np.int8)  # Open box: double-sided, never back-face culled
+
+    def get_mesh(self):
+        """
+        Player mesh, indexed like the level: vx, vy, vz (8,) float32 corners,
+        tris (6,3) int32, winding (6,) int8.
+        The corner arrays are owned by the player and rewritten on every call.
+        """
         x, y, z = self.pos.x, self.pos.y, self.pos.z
-        
-        # Rotate logic inline for player only
-        cy, sy = math.cos(-self.yaw), math.sin(-self.yaw)
-        
-        def rot(vx, vz):
-            return (vx * cy - vz * sy + x, vx * sy + vz * cy + z)
-
-        # Draw a simple character (Body + Hat)
-        # Simplified to just 2 boxes conceptually, but generated as tris
-        # We'll just generate a red box for now to save FPS on player model
-        tris = []
-        
-        # Coordinates relative to player center
-        corners = [(-s, 0, -s), (s, 0, -s), (s, s*2, -s), (-s, s*2, -s), # Front
-                   (-s, 0, s), (s, 0, s), (s, s*2, s), (-s, s*2, s)]   # Back
-        
-        # Rotate and translate
-        w_verts = []
-        for cx, cy_local, cz in corners:
-            rx, rz = rot(cx, cz)
-            w_verts.append(Vector3(rx, y + cy_local, rz))
-
-        # Box Indices
-        # Front
-        tris.append(Triangle(w_verts[0], w_verts[1], w_verts[2], BLUE))
-        tris.append(Triangle(w_verts[0], w_verts[2], w_verts[3], BLUE))
-        # Back
-        tris.append(Triangle(w_verts[5], w_verts[4], w_verts[7], RED))
-        tris.append(Triangle(w_verts[5], w_verts[7], w_verts[6], RED))
-        # Top (Hat)
-        tris.append(Triangle(w_verts[3], w_verts[2], w_verts[6], RED))
-        tris.append(Triangle(w_verts[3], w_verts[6], w_verts[7], RED))
-        
-        return tris
+        yaw, c, s = self._mesh_trig
+        if yaw != self.yaw:
+            c, s = math.cos(-self.yaw), math.sin(-self.yaw)
+            self._mesh_trig = (self.yaw, c, s)
+
+        # Rotate and translate straight into the preallocated corner columns
+        lx, lz = self.MESH_X, self.MESH_Z
+        self.mesh_vx[:] = lx * c - lz * s + x
+        self.mesh_vy[:] = self.MESH_Y + y
+        self.mesh_vz[:] = lx * s + lz * c + z
+        return (self.mesh_vx, self.mesh_vy, self.mesh_vz,
+                self.MESH_IDX, self.MESH_WINDING)
 
 # --- Game ---
 
+@njit(cache=True, fastmath=True)
+def camera_step(cx, cy, cz, px, py, pz, pyaw, dist, height):
+    """Lakitu-style follow on plain floats; returns the new camera (x, y, z, yaw)."""
+    target_x = px - math.sin(pyaw) * dist
+    target_z = pz - math.cos(pyaw) * dist
+    target_y = py + height
+
+    cx += (target_x - cx) * CAM_SMOOTH
+    cy += (target_y - cy) * CAM_SMOOTH
+    cz += (target_z - cz) * CAM_SMOOTH
+
+    return cx, cy, cz, math.atan2(px - cx, pz - cz)
+
 class Game:
     def __init__(self):
         pygame.init()
         # Scale 2x for retro look and performance
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        self.render_surf = pygame.Surface((RENDER_WIDTH, RENDER_HEIGHT))
+        # Same pixel format as the display, so the per-frame upscale is a straight copy
+        self.render_surf = pygame.Surface((RENDER_WIDTH, RENDER_HEIGHT)).convert()
+
+        # Static sky + simple ground plane horizon, drawn once
+        self.sky_bg = pygame.Surface((RENDER_WIDTH, RENDER_HEIGHT)).convert()
+        self.sky_bg.fill(SKY_BLUE)
+        pygame.draw.rect(self.sky_bg, DARK_GREEN, (0, RENDER_HEIGHT//2, RENDER_WIDTH, RENDER_HEIGHT//2))
         
         pygame.display.set_caption("Super Mario 64 Python Edition")
+        # Only quit/escape go through the queue; movement reads key.get_pressed()
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed((pygame.QUIT, pygame.KEYDOWN))
         self.clock = pygame.time.Clock()
         self.font = pygame.font.SysFont('arial', 12)
         self.font_big = pygame.font.SysFont('times new roman', 24, bold=True)
 
+        # HUD text: the controls line never changes; the debug line is only
+        # re-rendered when one of its numbers does, and at most every HUD_INTERVAL_MS
+        self.controls_surf = self.font_big.render("WASD/Arrows + Space | Shift to Run", True, YELLOW)
+        self._debug_key = None
+        self._debug_surf = None
+        self._hud_next_ms = 0
+
         self.player = Player(0, 10, -400)
         self.level = Level()
         
         # Camera
-        self.cam_pos = Vector3(0, 100, -600)
+        self.cam_pos = Vector3(0.0, 100.0, -600.0)
         self.cam_yaw = 0.0
+        self._cam_trig = (None, 1.0, 0.0)  # (yaw, cos, sin) last used by draw
         self.cam_dist = 350
         self.cam_pitch_height = 120
 
+        # Projection output buffers, reused across frames, plus the level part
+        # of the last projection and the camera it was made from
+        self._proj_cache = None
+        self._alloc_outputs(0)
+
+        # Shared palette of level + player colors; triangles carry an index into
+        # it, and the raster loop picks ready-made shaded tuples from the table
+        palette, pal = np.unique(np.concatenate((self.level.colors, Player.MESH_COLORS)),
+                                 return_inverse=True)
+        self._lvl_pal = pal[:self.level.count].astype(np.intp)
+        self._ply_pal = pal[self.level.count:].astype(np.intp)
+        self.shade_lut = build_shade_lut(palette)
+
+        if HAVE_NUMBA:
+            self.warm_up()
+
+    def _alloc_outputs(self, n):
+        # Fresh buffers hold no projection, so drop the cached one
+        self._cam_sig = None
+        self._out_z = np.empty(n, np.float32)
+        self._out_sx = np.empty((n, 3), np.float32)
+        self._out_sy = np.empty((n, 3), np.float32)
+        self._out_valid = np.empty(n, np.bool_)
+
+    def warm_up(self):
+        """
+        Compiles (or loads from the on-disk cache) every jitted kernel with the
+        exact argument types the game loop uses, before the first frame.
+        """
+        p, v, pl = self.player.pos, self.player.vel, self.player
+        physics_step(p.x, p.y, p.z, v.x, v.y, v.z, pl.yaw, pl.grounded, 0)
+        c = self.cam_pos
+        camera_step(c.x, c.y, c.z, p.x, p.y, p.z, pl.yaw, self.cam_dist, self.cam_pitch_height)
+        # project_all is specialized separately for the level and player arrays
+        self.draw()
+
     def update_camera(self):
         # Lakitu-style follow
-        target_x = self.player.pos.x - math.sin(self.player.yaw) * self.cam_dist
-        target_z = self.player.pos.z - math.cos(self.player.yaw) * self.cam_dist
-        target_y = self.player.pos.y + self.cam_pitch_height
-
-        self.cam_pos.x += (target_x - self.cam_pos.x) * CAM_SMOOTH
-        self.cam_pos.y += (target_y - self.cam_pos.y) * CAM_SMOOTH
-        self.cam_pos.z += (target_z - self.cam_pos.z) * CAM_SMOOTH
-
-        dx = self.player.pos.x - self.cam_pos.x
-        dz = self.player.pos.z - self.cam_pos.z
-        self.cam_yaw = math.atan2(dx, dz)
+        p, c = self.player.pos, self.cam_pos
+        c.x, c.y, c.z, self.cam_yaw = camera_step(c.x, c.y, c.z, p.x, p.y, p.z, self.player.yaw,
+                                                  self.cam_dist, self.cam_pitch_height)
 
     def draw(self):
-        # 1. Clear Sky
-        self.render_surf.fill(SKY_BLUE)
-        # Simple ground plane horizon
-        pygame.draw.rect(self.render_surf, DARK_GREEN, (0, RENDER_HEIGHT//2, RENDER_WIDTH, RENDER_HEIGHT//2))
+        # 1. Clear Sky + ground horizon (one copy of the prebuilt background)
+        self.render_surf.blit(self.sky_bg, (0, 0))
 
         # 2. Prepare Render List
-        # Combine level and player
-        all_tris = self.level.triangles + self.player.get_mesh_tris()
-        
-        # 3. Project & Sort
-        screen_tris = []
-        
         cx, cy, cz = self.cam_pos.x, self.cam_pos.y, self.cam_pos.z
-        cos_yaw = math.cos(self.cam_yaw)
-        sin_yaw = math.sin(self.cam_yaw)
+        yaw, cos_yaw, sin_yaw = self._cam_trig
+        if yaw != self.cam_yaw:
+            cos_yaw, sin_yaw = math.cos(self.cam_yaw), math.sin(self.cam_yaw)
+            self._cam_trig = (self.cam_yaw, cos_yaw, sin_yaw)
         hw, hh = RENDER_WIDTH / 2, RENDER_HEIGHT / 2
 
-        # Batch projection
-        for tri in all_tris:
-            res = project_triangle(tri, cx, cy, cz, cos_yaw, sin_yaw, RENDER_WIDTH, RENDER_HEIGHT, hw, hh)
-            if res:
-                screen_tris.append(res)
+        lvl = self.level
+        pvx, pvy, pvz, ptris, pwind = self.player.get_mesh()
+        n_ply = len(ptris)
+        n_total = lvl.count + n_ply
+        cam = (cx, cy, cz, cos_yaw, sin_yaw, RENDER_WIDTH, RENDER_HEIGHT, hw, hh)
+
+        # 3. Project & Sort
+        # Level and player go through the same kernel into adjacent slices of
+        # the output buffers; nothing is concatenated on the input side.
+        # The level part only depends on the camera, so it is reused as long
+        # as the camera hasn't moved; the player is always reprojected.
+        sig = (round(cx, 3), round(cy, 3), round(cz, 3), round(self.cam_yaw, 3))
+        if sig != self._cam_sig:
+            # Only triangles of objects whose bounding sphere touches the frustum,
+            # and of those only the ones facing the camera (one dot product each;
+            # double-sided triangles carry an always-pass plane, see Level.add_tris)
+            obj_vis = visible_objects(lvl.bounds, cx, cy, cz, cos_yaw, sin_yaw, hw, hh)
+            idx = np.flatnonzero(np.repeat(obj_vis, lvl.obj_counts))
+            idx = idx[lvl.planes[idx] @ (cx, cy, cz, -1.0) > 0]
+            n_lvl = len(idx)
+            if self._out_z.shape[0] < n_lvl + n_ply:
+                self._alloc_outputs(n_lvl + n_ply)
+            live = project_visible(lvl.vx, lvl.vy, lvl.vz, lvl.tris[idx], lvl.winding[idx],
+                                   cam, self._out_z[:n_lvl], self._out_sx[:n_lvl],
+                                   self._out_sy[:n_lvl], self._out_valid[:n_lvl])
+            # Depth keys are scaled to this view's farthest triangle, so there
+            # is no fixed depth limit; the scale is kept for merging the player
+            z_lvl = self._out_z[live]
+            scale = depth_scale(z_lvl.max() if len(live) else 1.0)
+            by_depth, key_lvl = sort_by_depth(z_lvl, scale)
+            order_lvl = live[by_depth]
+            shade_lvl = shade_index(self._lvl_pal[idx[order_lvl]], self._out_z[order_lvl])
+            self._proj_cache = (n_lvl, order_lvl, key_lvl, scale, shade_lvl)
+            self._cam_sig = sig
+        n_lvl, order_lvl, key_lvl, scale, shade_lvl = self._proj_cache
+        n = n_lvl + n_ply
+        out_z, out_sx, out_sy = self._out_z[:n], self._out_sx[:n], self._out_sy[:n]
+        live = project_visible(pvx, pvy, pvz, ptris, pwind, cam,
+                               self._out_z[n_lvl:n], self._out_sx[n_lvl:n],
+                               self._out_sy[n_lvl:n], self._out_valid[n_lvl:n])
+        z_ply = out_z[live + n_lvl]
+        if len(live) and z_ply.max() * scale > 65535:
+            # Player beyond the cached level's depth range: widen the scale and
+            # re-key (and re-sort) the cached level so both runs share it
+            scale = depth_scale(z_ply.max())
+            by_depth, key_lvl = sort_by_depth(out_z[order_lvl], scale)
+            order_lvl, shade_lvl = order_lvl[by_depth], shade_lvl[by_depth]
+            self._proj_cache = (n_lvl, order_lvl, key_lvl, scale, shade_lvl)
+        by_depth, key_ply = sort_by_depth(z_ply, scale)
+        order_ply = live[by_depth]
+        shade_ply = shade_index(self._ply_pal[order_ply], out_z[order_ply + n_lvl])
 
         # Z-Sort (Painter's Algorithm)
-        # Sorting is the most expensive CPU op in Python, so we rely on reduced poly count
-        screen_tris.sort(key=lambda x: x[0], reverse=True)
+        # Both runs are already far-to-near, so merge them: each player triangle
+        # goes after the level triangles at the same or greater depth
+        pos = np.searchsorted(key_lvl, key_ply, side='right')
+        order = np.insert(order_lvl, pos, order_ply + n_lvl)
+        shade = np.insert(shade_lvl, pos, shade_ply)
 
         # 4. Rasterize
-        for z, pts, col in screen_tris:
-            # Simple depth shading
-            shade_factor = 1.0 - min(z / 2000.0, 0.6)
-            r = int(col[0] * shade_factor)
-            g = int(col[1] * shade_factor)
-            b = int(col[2] * shade_factor)
-            
-            # Clamp
-            r = max(0, min(255, r))
-            g = max(0, min(255, g))
-            b = max(0, min(255, b))
-            
-            pygame.draw.polygon(self.render_surf, (r,g,b), pts)
+        # Corner points in draw order. Most triangles go through gfxdraw with
+        # integer points cast once for the whole batch; the few with a corner
+        # far off screen (clamped near-plane vertices) would overflow its
+        # fixed-point edge math, so those keep the float draw.polygon path.
+        pts = np.stack((out_sx[order], out_sy[order]), axis=2)
+        far = (np.abs(pts) > GFX_COORD_LIMIT).any(axis=(1, 2))
+        pts_i = np.rint(np.clip(pts, -GFX_COORD_LIMIT, GFX_COORD_LIMIT)).astype(np.int16)
+
+        # Hot loop: bind the draw calls and target once instead of per triangle
+        fill_polygon = pygame.gfxdraw.filled_polygon
+        draw_polygon = pygame.draw.polygon
+        surf = self.render_surf
+        lut = self.shade_lut
+        # Lock once for the whole batch; the per-call locks then only bump a count
+        surf.lock()
+        try:
+            for tri, tri_i, big, k in zip(pts.tolist(), pts_i.tolist(), far.tolist(), shade.tolist()):
+                rgb = lut[k]
+                if big:
+                    draw_polygon(surf, rgb, tri)
+                else:
+                    fill_polygon(surf, tri_i, rgb)
+        finally:
+            surf.unlock()
 
         # 5. UI & Upscale
         # Scale up to window size
         pygame.transform.scale(self.render_surf, (SCREEN_WIDTH, SCREEN_HEIGHT), self.screen)
         
         # HUD
-        fps = int(self.clock.get_fps())
-        debug = self.font.render(f"FPS: {fps} | Tris: {len(screen_tris)}/{len(all_tris)}", True, WHITE)
-        controls = self.font_big.render("WASD/Arrows + Space | Shift to Run", True, YELLOW)
-        
-        self.screen.blit(debug, (10, 10))
-        self.screen.blit(controls, (10, SCREEN_HEIGHT - 40))
+        now = pygame.time.get_ticks()
+        if now >= self._hud_next_ms:
+            self._hud_next_ms = now + HUD_INTERVAL_MS
+            debug_key = (int(self.clock.get_fps()), len(order), n_total)
+            if debug_key != self._debug_key:
+                self._debug_key = debug_key
+                self._debug_surf = self.font.render("FPS: %d | Tris: %d/%d" % debug_key, True, WHITE)
+
+        # One batched blit call for the HUD layer (fblits on pygame-ce)
+        hud = [(self._debug_surf, (10, 10)), (self.controls_surf, (10, SCREEN_HEIGHT - 40))]
+        if hasattr(self.screen, 'fblits'):
+            self.screen.fblits(hud)
+        else:
+            self.screen.blits(hud, doreturn=False)
 
     def run(self):
         while True:
             dt = self.clock.tick(FPS) / 1000.0
             
-            for event in pygame.event.get():
+            for event in pygame.event.get((pygame.QUIT, pygame.KEYDOWN)):
                 if event.type == pygame.QUIT:
                     pygame.quit()
                     sys.exit()
@@ -1,6 +1,7 @@
 import pygame
 import math
 import sys
+from operator import itemgetter
 
 # --- Constants & Configuration ---
 SCREEN_WIDTH = 800
@@ -382,7 +383,7 @@ class Game:
                 screen_tris.append((avg_z, [p1, p2, p3], tri.color))
 
         # Sort: Furthest Z first (descending order)
-        screen_tris.sort(key=lambda x: x[0], reverse=True)
+        screen_tris.sort(key=itemgetter(0), reverse=True)
 
         # 4. Rasterization
         for z, points, color in screen_tris:
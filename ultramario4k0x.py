@@ -1,6 +1,7 @@
 import pygame
 import math
 import sys
+from operator import itemgetter
 
 # --- Constants & Configuration ---
 SCREEN_WIDTH = 800
@@ -23,12 +24,21 @@ GRAVITY = 0.8
 JUMP_FORCE = 15.0
 MOVE_SPEED = 0.5
 MAX_SPEED = 8.0
+MAX_SPEED_SQ = MAX_SPEED * MAX_SPEED
 FRICTION = 0.85
 TURN_SPEED = 0.08
 
+# Input bitmask bits (keyboard is snapshotted once per frame)
+KEY_FORWARD = 1 << 0
+KEY_BACK = 1 << 1
+KEY_LEFT = 1 << 2
+KEY_RIGHT = 1 << 3
+KEY_JUMP = 1 << 4
+
 # --- Math Engine (N64-style Projection) ---
 
 class Vector3:
+    __slots__ = ['x', 'y', 'z']
     def __init__(self, x, y, z):
         self.x, self.y, self.z = x, y, z
 
@@ -47,6 +57,7 @@ class Vector3:
         return Vector3(new_x, self.y, new_z)
 
 class Triangle:
+    __slots__ = ['vertices', 'color', 'avg_z']
     def __init__(self, v1, v2, v3, color):
         self.vertices = [v1, v2, v3] # List of Vector3
         self.color = color
@@ -82,7 +93,40 @@ def project(vector, camera_pos, camera_yaw, width, height):
     screen_x = (rx * fov) / rz + (width / 2)
     screen_y = -(ry * fov) / rz + (height / 2)
 
-    return (int(screen_x), int(screen_y)), rz
+    # pygame.draw accepts float coordinates, so no per-vertex int() boxing
+    return (screen_x, screen_y), rz
+
+def project_points(points, camera_pos, camera_yaw, width, height):
+    """
+    Batch version of project() for a list of (x, y, z) tuples.
+    The yaw rotation is computed once for the whole batch; points
+    behind the camera come back as None.
+    """
+    cos_a = math.cos(camera_yaw)
+    sin_a = math.sin(camera_yaw)
+    cam_x, cam_y, cam_z = camera_pos.x, camera_pos.y, camera_pos.z
+    half_w, half_h = width / 2, height / 2
+    fov = 400  # Same focal length as project()
+
+    out = []
+    for px, py, pz in points:
+        x = px - cam_x
+        z = pz - cam_z
+        rz = x * sin_a + z * cos_a
+        if rz <= 1.0:
+            out.append(None)
+            continue
+        rx = x * cos_a - z * sin_a
+        out.append(((rx * fov) / rz + half_w, -((py - cam_y) * fov) / rz + half_h))
+    return out
+
+def read_input(keys):
+    """ Packs the movement keys into a single int so update() only does bit tests """
+    return ((keys[pygame.K_UP] or keys[pygame.K_w]) << 0 |
+            (keys[pygame.K_DOWN] or keys[pygame.K_s]) << 1 |
+            (keys[pygame.K_LEFT] or keys[pygame.K_a]) << 2 |
+            (keys[pygame.K_RIGHT] or keys[pygame.K_d]) << 3 |
+            keys[pygame.K_SPACE] << 4)
 
 # --- Game Objects ---
 
@@ -95,19 +139,19 @@ class Player:
         self.color = RED
         self.size = 20 # Visual size for collision/drawing logic
 
-    def update(self, keys, dt, auto_move=False):
-        # Input handling (if not auto)
+    def update(self, kb, dt, auto_move=False):
+        # Input handling (if not auto) - kb is the bitmask from read_input()
         forward = 0
         turning = 0
 
         if not auto_move:
-            if keys[pygame.K_UP] or keys[pygame.K_w]:
+            if kb & KEY_FORWARD:
                 forward = 1
-            if keys[pygame.K_DOWN] or keys[pygame.K_s]:
+            if kb & KEY_BACK:
                 forward = -1
-            if keys[pygame.K_LEFT] or keys[pygame.K_a]:
+            if kb & KEY_LEFT:
                 turning = 1
-            if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
+            if kb & KEY_RIGHT:
                 turning = -1
         else:
             # Auto‑move during intro: run forward and do a little jump
@@ -117,21 +161,21 @@ class Player:
         # Rotation
         self.yaw += turning * TURN_SPEED
 
-        # Acceleration
-        speed_vector = Vector3(0, 0, forward * MOVE_SPEED)
-        speed_vector = speed_vector.rotate_y(-self.yaw) # Rotate input to facing
-
-        self.vel.x += speed_vector.x
-        self.vel.z += speed_vector.z
+        # Acceleration (input (0, 0, dv) rotated to facing, rotate_y inlined)
+        # Idle / turn-only frames add nothing, so skip the trig entirely
+        if forward != 0:
+            dv = forward * MOVE_SPEED
+            self.vel.x += dv * math.sin(self.yaw)
+            self.vel.z += dv * math.cos(self.yaw)
 
         # Apply Friction
         self.vel.x *= FRICTION
         self.vel.z *= FRICTION
 
-        # Speed Cap
-        current_speed = math.sqrt(self.vel.x**2 + self.vel.z**2)
-        if current_speed > MAX_SPEED:
-            scale = MAX_SPEED / current_speed
+        # Speed Cap (compare squared speed, only take the sqrt when capping)
+        speed_sq = self.vel.x * self.vel.x + self.vel.z * self.vel.z
+        if speed_sq > MAX_SPEED_SQ:
+            scale = MAX_SPEED / math.sqrt(speed_sq)
             self.vel.x *= scale
             self.vel.z *= scale
 
@@ -141,7 +185,7 @@ class Player:
             if self.grounded and pygame.time.get_ticks() % 2000 < 20:  # roughly every 2 sec
                 self.vel.y = JUMP_FORCE
                 self.grounded = False
-        elif keys[pygame.K_SPACE] and self.grounded:
+        elif kb & KEY_JUMP and self.grounded:
             self.vel.y = JUMP_FORCE
             self.grounded = False
         
@@ -164,28 +208,14 @@ class Player:
         s = self.size
         x, y, z = self.pos.x, self.pos.y, self.pos.z
         
-        # Cube vertices relative to center
-        # Front face
-        v1 = Vector3(x-s, y+2*s, z-s)
-        v2 = Vector3(x+s, y+2*s, z-s)
-        v3 = Vector3(x+s, y, z-s)
-        v4 = Vector3(x-s, y, z-s)
-        # Back face
-        v5 = Vector3(x-s, y+2*s, z+s)
-        v6 = Vector3(x+s, y+2*s, z+s)
-        v7 = Vector3(x+s, y, z+s)
-        v8 = Vector3(x-s, y, z+s)
+        # Cube vertices relative to center (x, z offsets are rotated below)
+        corners = [(-s, 2*s, -s), (s, 2*s, -s), (s, 0, -s), (-s, 0, -s),  # Front face
+                   (-s, 2*s, s), (s, 2*s, s), (s, 0, s), (-s, 0, s)]      # Back face
 
         # Rotate vertices around player center (Y-axis only for visual rotation)
-        def rot(v):
-            # Translate to origin -> rotate -> translate back
-            vx, vz = v.x - x, v.z - z
-            cos_a, sin_a = math.cos(self.yaw), math.sin(self.yaw)
-            nx = vx * math.cos(-self.yaw) - vz * math.sin(-self.yaw)
-            nz = vx * math.sin(-self.yaw) + vz * math.cos(-self.yaw)
-            return Vector3(x + nx, v.y, z + nz)
-
-        rv = [rot(v) for v in [v1, v2, v3, v4, v5, v6, v7, v8]]
+        cos_a, sin_a = math.cos(-self.yaw), math.sin(-self.yaw)
+        rv = [Vector3(x + ox * cos_a - oz * sin_a, y + oy, z + ox * sin_a + oz * cos_a)
+              for ox, oy, oz in corners]
 
         tris = []
         # Front (Red - Shirt)
@@ -280,8 +310,33 @@ class Game:
         self.state = "MENU"
         self.intro_start_time = 0
         self.intro_duration = 10000  # 10 seconds
+
+        # Last rendered game scene and the key it was rendered for;
+        # reused as-is while the key stays the same.
+        self._scene_cache = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self._scene_key = None
+
+        self.init_menu_scene()
         self.init_gameplay()
 
+    def init_menu_scene(self):
+        # The floating menu cubes never move, only the camera yaw does,
+        # so their corners and edge list are built once here.
+        self.menu_cam_pos = Vector3(0, 100, -400)
+        self.menu_corners = []
+        self.menu_edges = []
+        cube_edges = [(0,1), (1,2), (2,3), (3,0),  # front face
+                      (4,5), (5,6), (6,7), (7,4),  # back face
+                      (0,4), (1,5), (2,6), (3,7)]  # connecting edges
+        s = 30
+        for px, py, pz in [(-150, 50, 100), (150, 100, -100), (0, 150, 0)]:
+            base = len(self.menu_corners)
+            self.menu_corners += [(px-s, py+s, pz-s), (px+s, py+s, pz-s),
+                                  (px+s, py-s, pz-s), (px-s, py-s, pz-s),
+                                  (px-s, py+s, pz+s), (px+s, py+s, pz+s),
+                                  (px+s, py-s, pz+s), (px-s, py-s, pz+s)]
+            self.menu_edges += [(base + a, base + b) for a, b in cube_edges]
+
     def init_gameplay(self):
         self.player = Player(0, 50, 0)
         self.level = Level()
@@ -353,41 +408,17 @@ class Game:
             self.cam_yaw = math.atan2(dx, dz)
 
     def draw_menu(self):
-        self.screen.fill(BLACK)
-        
         # 3D rotating cubes in background (simple effect)
-        # We'll create a few cubes floating and rotating for atmosphere
-        # This is just a simple illusion – draw some flat cubes with depth
-        # using the existing project function, but with a separate dummy camera
-        # that rotates over time.
-        menu_cam_pos = Vector3(0, 100, -400)
+        # The cube corners are precomputed in init_menu_scene; only the
+        # dummy camera rotates over time, so each frame is one batch projection.
         menu_cam_yaw = pygame.time.get_ticks() * 0.001  # slowly rotate
 
-        # Draw a few floating cubes
-        cube_positions = [Vector3(-150, 50, 100), Vector3(150, 100, -100), Vector3(0, 150, 0)]
-        for pos in cube_positions:
-            # Simple cube wireframe
-            s = 30
-            v1 = Vector3(pos.x-s, pos.y+s, pos.z-s)
-            v2 = Vector3(pos.x+s, pos.y+s, pos.z-s)
-            v3 = Vector3(pos.x+s, pos.y-s, pos.z-s)
-            v4 = Vector3(pos.x-s, pos.y-s, pos.z-s)
-            v5 = Vector3(pos.x-s, pos.y+s, pos.z+s)
-            v6 = Vector3(pos.x+s, pos.y+s, pos.z+s)
-            v7 = Vector3(pos.x+s, pos.y-s, pos.z+s)
-            v8 = Vector3(pos.x-s, pos.y-s, pos.z+s)
-            corners = [v1, v2, v3, v4, v5, v6, v7, v8]
-            # Project all corners
-            proj = [project(v, menu_cam_pos, menu_cam_yaw, SCREEN_WIDTH, SCREEN_HEIGHT) for v in corners]
-            # Draw lines between appropriate indices
-            edges = [(0,1), (1,2), (2,3), (3,0),  # front face
-                     (4,5), (5,6), (6,7), (7,4),  # back face
-                     (0,4), (1,5), (2,6), (3,7)]  # connecting edges
-            for e in edges:
-                if proj[e[0]] and proj[e[1]]:
-                    p1, _ = proj[e[0]]
-                    p2, _ = proj[e[1]]
-                    pygame.draw.line(self.screen, YELLOW, p1, p2, 2)
+        self.screen.fill(BLACK)
+        proj = project_points(self.menu_corners, self.menu_cam_pos, menu_cam_yaw, SCREEN_WIDTH, SCREEN_HEIGHT)
+        for i, j in self.menu_edges:
+            p1, p2 = proj[i], proj[j]
+            if p1 and p2:
+                pygame.draw.line(self.screen, YELLOW, p1, p2, 2)
 
         # Title with shadow
         title = self.font_big.render("ULTRA MARIO 3D BROS", True, RED)
@@ -410,7 +441,35 @@ class Game:
         sk_rect = skip_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT - 40))
         self.screen.blit(skip_text, sk_rect)
 
+    def scene_key(self):
+        # Everything the 3D scene depends on, rounded so that the tail of
+        # friction / camera smoothing doesn't count as movement
+        p, c = self.player.pos, self.cam_pos
+        return (round(self.cam_yaw, 3), round(c.x, 3), round(c.y, 3), round(c.z, 3),
+                round(p.x, 3), round(p.y, 3), round(p.z, 3), round(self.player.yaw, 3))
+
     def draw_game(self):
+        # Idle player + settled camera -> reuse last frame's scene
+        key = self.scene_key()
+        if key == self._scene_key:
+            self.screen.blit(self._scene_cache, (0, 0))
+        else:
+            self.draw_scene()
+            self._scene_cache.blit(self.screen, (0, 0))
+            self._scene_key = key
+
+        # HUD
+        fps = int(self.clock.get_fps())
+        pygame.draw.rect(self.screen, BLACK, (10, 10, 100, 30))
+        fps_text = self.font_small.render(f"FPS: {fps}", True, WHITE)
+        self.screen.blit(fps_text, (20, 15))
+
+        if self.state == "INTRO":
+            # Show a small "Intro - press SPACE to skip"
+            skip_surf = self.font_small.render("Intro (SPACE to skip)", True, WHITE)
+            self.screen.blit(skip_surf, (SCREEN_WIDTH - 200, 20))
+
+    def draw_scene(self):
         # 1. Background
         self.screen.fill(SKY_BLUE)
         pygame.draw.rect(self.screen, (34, 100, 34), (0, SCREEN_HEIGHT//2, SCREEN_WIDTH, SCREEN_HEIGHT//2))
@@ -446,7 +505,7 @@ class Game:
                 screen_tris.append((avg_z, [p1, p2, p3], tri.color))
 
         # Sort: Furthest Z first
-        screen_tris.sort(key=lambda x: x[0], reverse=True)
+        screen_tris.sort(key=itemgetter(0), reverse=True)
 
         # 4. Rasterization
         for z, points, color in screen_tris:
@@ -459,18 +518,6 @@ class Game:
             )
             
             pygame.draw.polygon(self.screen, shaded_color, points)
-            pygame.draw.polygon(self.screen, BLACK, points, 1)
-
-        # HUD
-        fps = int(self.clock.get_fps())
-        pygame.draw.rect(self.screen, BLACK, (10, 10, 100, 30))
-        fps_text = self.font_small.render(f"FPS: {fps}", True, WHITE)
-        self.screen.blit(fps_text, (20, 15))
-
-        if self.state == "INTRO":
-            # Show a small "Intro - press SPACE to skip"
-            skip_surf = self.font_small.render("Intro (SPACE to skip)", True, WHITE)
-            self.screen.blit(skip_surf, (SCREEN_WIDTH - 200, 20))
 
     def run(self):
         while True:
@@ -480,8 +527,8 @@ class Game:
                 self.draw_menu()
             elif self.state == "INTRO":
                 # Update intro
-                keys = pygame.key.get_pressed()
-                self.player.update(keys, 1/FPS, auto_move=True)
+                kb = read_input(pygame.key.get_pressed())
+                self.player.update(kb, 1/FPS, auto_move=True)
                 self.update_camera(auto=True)
 
                 # Check if intro time is up
@@ -491,8 +538,8 @@ class Game:
                 
                 self.draw_game()
             elif self.state == "PLAY":
-                keys = pygame.key.get_pressed()
-                self.player.update(keys, 1/FPS)
+                kb = read_input(pygame.key.get_pressed())
+                self.player.update(kb, 1/FPS)
                 self.update_camera(auto=False)
                 self.draw_game()
 
@@ -1,6 +1,7 @@
 import pygame
 import math
 import sys
+from operator import itemgetter
 
 # --- Constants & Configuration ---
 SCREEN_WIDTH = 800
@@ -441,7 +442,7 @@ class Game:
 
         # Z-Sort (Painter's Algorithm)
         # Sorting is the most expensive CPU op in Python, so we rely on reduced poly count
-        screen_tris.sort(key=lambda x: x[0], reverse=True)
+        screen_tris.sort(key=itemgetter(0), reverse=True)
 
         # 4. Rasterize
         for z, pts, col in screen_tris:
@@ -493,6 +494,7 @@ if __name__ == "__main__":
     Game().run()import pygame
 import math
 import sys
+from operator import itemgetter
 
 # --- Constants & Configuration ---
 SCREEN_WIDTH = 800
@@ -933,7 +935,7 @@ class Game:
 
         # Z-Sort (Painter's Algorithm)
         # Sorting is the most expensive CPU op in Python, so we rely on reduced poly count
-        screen_tris.sort(key=lambda x: x[0], reverse=True)
+        screen_tris.sort(key=itemgetter(0), reverse=True)
 
         # 4. Rasterize
         for z, pts, col in screen_tris: